@@ -1,19 +1,45 @@
-from elasticsearch import Elasticsearch
+from elasticsearch import Elasticsearch, helpers
+from elasticsearch.serializer import OrjsonSerializer  # requires orjson to be installed
 
-# Initialize client
-es = Elasticsearch("http://your-es-host:9200")
+# Initialize client (reused for all requests)
+es = Elasticsearch(
+    "http://your-es-host:9200",
+    http_compress=True,          # gzip request/response bodies
+    connections_per_node=25,     # keep-alive connection pool size per node
+    request_timeout=30,
+    retry_on_timeout=True,
+    sniff_on_start=True,         # discover nodes so scroll requests spread across them
+    sniff_on_node_failure=True,
+    serializer=OrjsonSerializer(),
+)
 
 index_name = "your_index"
-id_field = "id"
+id_field = "id"  # Use "id.keyword" if id is mapped as text, to avoid fielddata
 timestamp_field = "your_timestamp_field"
 exclude_ids = ["x1", "x2", "x3", "x4"]
 start_time = "t1"
 end_time = "t2"
 
+if id_field == "_id":
+    # Exclude by document id directly instead of a term dictionary lookup
+    exclude_clause = {
+        "ids": {
+            "values": exclude_ids
+        }
+    }
+else:
+    # id_field should be mapped as keyword (not text) so no fielddata is used
+    exclude_clause = {
+        "terms": {
+            id_field: exclude_ids
+        }
+    }
+
 query = {
+    "_source": [id_field, timestamp_field],
     "query": {
         "bool": {
-            "must": [
+            "filter": [
                 {
                     "range": {
                         timestamp_field: {
@@ -24,15 +50,13 @@ query = {
                 }
             ],
             "must_not": [
-                {
-                    "terms": {
-                        id_field: exclude_ids
-                    }
-                }
+                exclude_clause
             ]
         }
     }
 }
 
-response = es.search(index=index_name, body=query)
-print(response)
+# Stream all matching hits with the scroll API instead of a single capped search
+for hit in helpers.scan(es, index=index_name, query=query, size=1000, scroll="2m", preserve_order=False):
+    print(hit)
+
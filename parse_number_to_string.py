@@ -1,6 +1,33 @@
+from functools import lru_cache
 from pprint import pprint
 from tabulate import tabulate
 
+# (magnitude, suffix) from largest to smallest
+_SCALES = (
+    (1_000_000_000, 'B'),      # Billion
+    (1_000_000, 'M'),          # Million
+    (1_000, 'K'),              # Thousand
+)
+
+# Scale used for numbers below the smallest threshold
+_NO_SCALE = (1, None)
+
+# (magnitude, suffix) indexed by the suffix index returned by the batch kernel
+_BATCH_SCALES = _SCALES + (_NO_SCALE,)
+
+
+def _magnitude(num_abs):
+    """
+    Pick the (magnitude, suffix) pair used to scale a non-negative number.
+    Examples: 456789 -> (1_000, 'K'), 500 -> (1, None)
+    """
+    # Plain comparisons also cover inf (-> B), nan (-> no suffix) and ints of any size
+    for magnitude, suffix in _SCALES:
+        if num_abs >= magnitude:
+            return magnitude, suffix
+    return _NO_SCALE
+
+
 def format_number(num):
     """
     Format a number to compact notation with 2 decimal places.
@@ -14,40 +41,14 @@ def format_number(num):
         Examples: ("1.23B", "B", 1_000_000_000), ("45.67K", "K", 1_000)
     """
     
-    suffixes = [
-        (1_000_000_000, 'B'),      # Billion
-        (1_000_000, 'M'),          # Million
-        (1_000, 'K'),              # Thousand
-    ]
-    
-    is_negative = num < 0
+    # Same selection as _magnitude, inlined to save a call on this hot path
     num_abs = abs(num)
+    for magnitude, suffix in _SCALES:
+        if num_abs >= magnitude:
+            # Format the number (the sign is carried by num itself)
+            return f"{num / magnitude:.2f}{suffix}", suffix, magnitude
     
-    # Find the appropriate suffix for this number
-    chosen_suffix = None
-    chosen_magnitude = 1
-    
-    if num_abs >= 1_000:
-        for threshold, suffix in suffixes:
-            if num_abs >= threshold:
-                chosen_suffix = suffix
-                chosen_magnitude = threshold
-                break
-    
-    # Format the number
-    if chosen_suffix:
-        scaled = num / chosen_magnitude
-        result = f"{scaled:.2f}{chosen_suffix}"
-    else:
-        result = f"{num:.2f}"
-    
-    # Add negative sign if needed
-    if is_negative and num_abs >= 1_000:
-        result = '-' + result
-    elif is_negative:
-        result = '-' + result
-    
-    return result, chosen_suffix, chosen_magnitude
+    return f"{num:.2f}", None, 1
 
 
 def format_difference(x1, x2):
@@ -63,26 +64,8 @@ def format_difference(x1, x2):
         Examples: "1.23B", "0.00M", "45.67K"
     """
     
-    # Get formatted versions to determine the suffix of the largest number
-    formatted_x1, suffix_x1, mag_x1 = format_number(x1)
-    formatted_x2, suffix_x2, mag_x2 = format_number(x2)
-    
-    # Determine which number is larger and use its suffix/magnitude
-    largest_num = max(abs(x1), abs(x2))
-    
-    # Get the magnitude of the largest number
-    if largest_num < 1_000:
-        magnitude_to_use = 1
-        suffix_to_use = None
-    elif largest_num >= 1_000_000_000:
-        magnitude_to_use = 1_000_000_000
-        suffix_to_use = 'B'
-    elif largest_num >= 1_000_000:
-        magnitude_to_use = 1_000_000
-        suffix_to_use = 'M'
-    elif largest_num >= 1_000:
-        magnitude_to_use = 1_000
-        suffix_to_use = 'K'
+    # Use the suffix/magnitude of the larger number
+    magnitude_to_use, suffix_to_use = _magnitude(max(abs(x1), abs(x2)))
     
     # Calculate the difference
     difference = x1 - x2
@@ -97,6 +80,98 @@ def format_difference(x1, x2):
     return result
 
 
+@lru_cache(maxsize=1)
+def _scale_kernel():
+    """
+    Build (once) the Numba kernel that picks scales for an array of absolute values.
+    numpy and numba are only needed by the batch functions, so they are imported here.
+    """
+    import numpy as np
+    from numba import njit, prange
+    
+    # Thresholds from _SCALES, largest first; passed in (not captured) so cache=True works
+    thresholds = np.array([magnitude for magnitude, _ in _SCALES], dtype=np.float64)
+    
+    # cache=True stores the compiled kernel on disk, so only the first process pays the JIT cost
+    @njit(parallel=True, cache=True)
+    def pick_scales(nums_abs, thresholds):
+        n = nums_abs.shape[0]
+        magnitudes = np.ones(n)
+        suffix_idx = np.full(n, thresholds.shape[0], dtype=np.int64)
+        for i in prange(n):
+            value = nums_abs[i]
+            for j in range(thresholds.shape[0]):
+                if value >= thresholds[j]:
+                    magnitudes[i] = thresholds[j]
+                    suffix_idx[i] = j
+                    break
+        return magnitudes, suffix_idx
+    
+    return lambda nums_abs: pick_scales(nums_abs, thresholds)
+
+
+def _format_scaled(scaled, suffix_idx):
+    """
+    Format scaled values with the suffixes picked by the batch kernel.
+    """
+    results = []
+    for value, idx in zip(scaled.tolist(), suffix_idx.tolist()):
+        suffix = _BATCH_SCALES[idx][1]
+        results.append(f"{value:.2f}{suffix}" if suffix else f"{value:.2f}")
+    return results
+
+
+def format_number_batch(nums):
+    """
+    Format many numbers to compact notation in one pass (see format_number).
+    
+    Args:
+        nums: Sequence or numpy array of integers or floats
+    
+    Returns:
+        List of (formatted_string, suffix, original_magnitude) tuples, one per number
+    
+    Note: Values are converted to float64, so integers above 2**53 lose precision,
+          whereas format_number works on exact ints
+    """
+    import numpy as np
+    
+    nums = np.asarray(nums, dtype=np.float64)
+    magnitudes, suffix_idx = _scale_kernel()(np.abs(nums))
+    
+    formatted = _format_scaled(nums / magnitudes, suffix_idx)
+    
+    results = []
+    for result, idx in zip(formatted, suffix_idx.tolist()):
+        magnitude, suffix = _BATCH_SCALES[idx]
+        results.append((result, suffix, magnitude))
+    return results
+
+
+def format_difference_batch(x1s, x2s):
+    """
+    Format many x1 - x2 differences in one pass (see format_difference).
+    
+    Args:
+        x1s: Sequence or numpy array of first numbers
+        x2s: Sequence or numpy array of second numbers, same length as x1s
+    
+    Returns:
+        List of formatted difference strings, one per pair
+    
+    Note: Values are converted to float64, so integers above 2**53 lose precision
+          (e.g. small differences between large ints), whereas format_difference
+          works on exact ints
+    """
+    import numpy as np
+    
+    x1s = np.asarray(x1s, dtype=np.float64)
+    x2s = np.asarray(x2s, dtype=np.float64)
+    magnitudes, suffix_idx = _scale_kernel()(np.maximum(np.abs(x1s), np.abs(x2s)))
+    
+    return _format_scaled((x1s - x2s) / magnitudes, suffix_idx)
+
+
 # Test cases
 if __name__ == "__main__":
     test_cases = [
@@ -113,23 +188,34 @@ if __name__ == "__main__":
         (123654789963, 100, "Billion and hundereds"),
     ]
     
-    # Prepare data for tabulate
-    table_data = []
-    for x1, x2, desc in test_cases:
-        formatted_x1, _, _ = format_number(x1)
-        formatted_x2, _, _ = format_number(x2)
-        diff = format_difference(x1, x2)
-        
-        table_data.append({
-            "X1": f"{x1:,}",
-            "X2": f"{x2:,}",
-            "X1 Formatted": formatted_x1,
-            "X2 Formatted": formatted_x2,
-            "Difference": diff,
-            "Description": desc
-        })
+    # Build each column over all test cases (use the *_batch functions for large inputs)
+    x1s, x2s, descs = zip(*test_cases)
+    formatted_x1s = [result for result, _, _ in map(format_number, x1s)]
+    formatted_x2s = [result for result, _, _ in map(format_number, x2s)]
+    diffs = list(map(format_difference, x1s, x2s))
+    
+    headers = ["X1", "X2", "X1 Formatted", "X2 Formatted", "Difference", "Description"]
+    table_data = list(zip(
+        [f"{x1:,}" for x1 in x1s],
+        [f"{x2:,}" for x2 in x2s],
+        formatted_x1s,
+        formatted_x2s,
+        diffs,
+        descs,
+    ))
     
     # Print using tabulate
     print("\n")
-    print(tabulate(table_data, headers="keys", tablefmt="grid", showindex=False))
-    print("\n")
\ No newline at end of file
+    print(tabulate(table_data, headers=headers, tablefmt="grid", showindex=False))
+    print("\n")
+    
+    # Batch functions must match the scalar ones (requires numpy and numba)
+    print("--- Batch vs scalar ---")
+    try:
+        batch_x1s = format_number_batch(x1s)
+        batch_diffs = format_difference_batch(x1s, x2s)
+    except ImportError as e:
+        print(f"Skipped: {e}\n")
+    else:
+        print(f"format_number_batch matches:     {batch_x1s == list(map(format_number, x1s))}")
+        print(f"format_difference_batch matches: {batch_diffs == diffs}\n")
\ No newline at end of file
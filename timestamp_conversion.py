@@ -1,4 +1,29 @@
-from datetime import datetime, timezone
+import re
+import sys
+from functools import lru_cache
+from datetime import datetime, timedelta, timezone
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_ONE_US = timedelta(microseconds=1)
+_ONE_MS = timedelta(milliseconds=1)
+_ONE_SECOND = timedelta(seconds=1)
+_ZERO = timedelta(0)
+
+# Human-readable tokens and their strftime equivalents
+_TOKEN_RE = re.compile(r"YYYY|MM|DD|HH|MI|SS|offset|TZ")
+_TOKEN_MAP = {
+    "YYYY": "%Y",
+    "MM": "%m",       # Month (uppercase MM)
+    "DD": "%d",
+    "HH": "%H",
+    "MI": "%M",       # Minute (use MI instead of mm)
+    "SS": "%S",
+    "offset": "%z",
+    "TZ": "%Z",
+}
+
+# The one strftime template the batch converter formats in bulk
+_BATCH_NANOS_Z_FORMAT = "YYYY-MM-DDTHH:MI:SS.nnnnnnnnnZ"
 
 def _convert_readable_to_strftime(readable_format: str) -> str:
     """
@@ -11,18 +36,77 @@ def _convert_readable_to_strftime(readable_format: str) -> str:
     
     Note: Use "offset" without hyphen (it already includes + or -)
     """
-    # Important: replace in specific order to avoid conflicts
-    result = readable_format
-    result = result.replace("YYYY", "%Y")
-    result = result.replace("MM", "%m")   # Month (uppercase MM)
-    result = result.replace("DD", "%d")
-    result = result.replace("HH", "%H")
-    result = result.replace("MI", "%M")   # Minute (use MI instead of mm)
-    result = result.replace("SS", "%S")
-    result = result.replace("offset", "%z")
-    result = result.replace("TZ", "%Z")
-    
-    return result
+    # Single pass over the template, so replaced tokens are never re-scanned
+    return _TOKEN_RE.sub(lambda m: _TOKEN_MAP[m.group(0)], readable_format)
+
+
+@lru_cache(maxsize=256)
+def _compile_target(target_format: str) -> tuple:
+    """
+    Compile a target format into a reusable description.
+    
+    Returns:
+        tuple: (kind, strftime_format, has_nanos, has_Z)
+               kind is "epoch_ms", "epoch_sec" or "strftime"
+               With has_nanos, strftime_format holds a {NANOS} placeholder
+               to be replaced with the digits after strftime
+               With has_Z, the literal Z is already at the end of the template
+               and the timestamp must be converted to UTC before formatting
+    
+    Note: Depends only on target_format, so results are safe to cache
+    """
+    # Custom format names are dispatched on kind and need no template
+    if target_format in ("epoch_ms", "epoch_sec"):
+        return target_format, None, False, False
+    
+    has_nanos = "nnnnnnnnn" in target_format
+    has_Z = "Z" in target_format
+    
+    strftime_format = target_format
+    if has_nanos:
+        # Keep a placeholder for nanoseconds, filled in after strftime
+        strftime_format = strftime_format.replace("nnnnnnnnn", "{NANOS}")
+    if has_Z:
+        # Z is moved to the end as a literal, formatted after converting to UTC
+        strftime_format = _convert_readable_to_strftime(strftime_format.replace("Z", "")) + "Z"
+    else:
+        strftime_format = _convert_readable_to_strftime(strftime_format)
+    
+    return "strftime", strftime_format, has_nanos, has_Z
+
+
+if sys.version_info >= (3, 11):
+    # fromisoformat already accepts "-0800" and "Z" offsets
+    _parse_timestamp = datetime.fromisoformat
+else:
+    # Full ISO timestamp, split into body and optional UTC offset (Z, +HH:MM or +HHMM)
+    _TS_RE = re.compile(
+        r"^(?P<body>\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(?:\.\d+)?)"
+        r"(?P<tz>Z|[+-]\d{2}:?\d{2})?$"
+    )
+    
+    def _parse_timestamp(ts: str) -> datetime:
+        """
+        Parse an ISO timestamp, normalizing the offset so fromisoformat always accepts it.
+        
+        Examples:
+            "2025-11-01T00:00:00-0800" -> parsed as "2025-11-01T00:00:00-08:00"
+            "2025-11-01T00:00:00Z"     -> parsed as "2025-11-01T00:00:00+00:00"
+        """
+        match = _TS_RE.match(ts)
+        if match is None:
+            # Other ISO shapes (e.g. date only); fromisoformat raises ValueError if invalid
+            return datetime.fromisoformat(ts)
+        
+        tz = match.group("tz")
+        if tz is None or len(tz) == 6:
+            # Naive, or offset already has a colon
+            return datetime.fromisoformat(ts)
+        if tz == "Z":
+            return datetime.fromisoformat(match.group("body") + "+00:00")
+        
+        # Add colon for parsing: "-0800" -> "-08:00"
+        return datetime.fromisoformat(match.group("body") + tz[:3] + ":" + tz[3:])
 
 
 def convert_timestamp_format(ts: str, target_format: str) -> str:
@@ -59,84 +143,102 @@ def convert_timestamp_format(ts: str, target_format: str) -> str:
     
     Returns:
         str: Converted timestamp
+    
+    Raises:
+        ValueError: If ts is not a valid ISO 8601 timestamp
     """
     
-    try:
-        # Parse the input timestamp (handle both with and without colon in timezone)
-        dt = None
-        
-        # Try parsing with colon in timezone
-        try:
-            dt = datetime.fromisoformat(ts)
-        except:
-            # Try parsing without colon in timezone
-            if len(ts) >= 5 and ts[-5] in ["+", "-"] and ts[-3] != ":":
-                # Add colon for parsing: "2025-11-01T00:00:00-0800" -> "2025-11-01T00:00:00-08:00"
-                ts_with_colon = ts[:-2] + ":" + ts[-2:]
-                dt = datetime.fromisoformat(ts_with_colon)
-        
-        if dt is None:
-            raise ValueError(f"Could not parse timestamp: {ts}")
+    # Parse the input timestamp (handle both with and without colon in timezone)
+    dt = _parse_timestamp(ts)
+    
+    # Fast path for the most common template, formatted without strftime
+    if target_format == "YYYY-MM-DD":
+        return f"{dt.year:04d}-{dt.month:02d}-{dt.day:02d}"
+    
+    kind, strftime_format, has_nanos, has_Z = _compile_target(target_format)
+    
+    # Handle custom format names with special logic
+    if kind in ("epoch_ms", "epoch_sec"):
+        if dt.tzinfo is None:
+            # Naive timestamps are local time, resolved by datetime.timestamp()
+            # (including DST gaps); whole seconds keep the float result exact
+            seconds = int(dt.replace(microsecond=0).timestamp())
+            if kind == "epoch_ms":
+                return str(seconds * 1000 + dt.microsecond // 1000)
+            return str(seconds)
         
-        # Handle custom format names with special logic
-        if target_format == "epoch_ms":
+        # Exact integer arithmetic, no float rounding
+        if kind == "epoch_ms":
             # Milliseconds since epoch
-            return str(int(dt.timestamp() * 1000))
-        
-        elif target_format == "epoch_sec":
-            # Seconds since epoch
-            return str(int(dt.timestamp()))
-        
-        # ADD MORE CUSTOM FORMATS HERE USING elif
-        # elif target_format == "your_custom_format":
-        #     return your_custom_logic(dt)
-        
+            return str((dt - _EPOCH) // _ONE_MS)
+        # Seconds since epoch
+        return str((dt - _EPOCH) // _ONE_SECOND)
+    
+    # ADD MORE CUSTOM FORMATS HERE USING elif (and register the name in _compile_target)
+    # elif kind == "your_custom_format":
+    #     return your_custom_logic(dt)
+    
+    # Check if format contains Z (UTC indicator)
+    if has_Z:
+        # Convert to UTC before formatting (inputs already at +00:00 only drop the tzinfo)
+        if dt.utcoffset() == _ZERO:
+            dt = dt.replace(tzinfo=None)
         else:
-            # Check if format contains nanoseconds placeholder
-            if "nnnnnnnnn" in target_format:
-                # Extract nanoseconds from microseconds
-                # datetime only has microseconds, so pad with zeros to make 9 digits
-                microseconds = dt.microsecond
-                nanoseconds = microseconds * 1000  # Convert microseconds to nanoseconds
-                nanos_str = str(nanoseconds).zfill(9)  # Pad with zeros to 9 digits
-                
-                # Check if format contains Z (UTC indicator)
-                if "Z" in target_format:
-                    # Convert to UTC before formatting
-                    dt_utc = dt.astimezone(timezone.utc).replace(tzinfo=None)
-                    strftime_format = target_format.replace("nnnnnnnnn", "{NANOS}").replace("Z", "")
-                    strftime_format = _convert_readable_to_strftime(strftime_format)
-                    result = dt_utc.strftime(strftime_format) + "Z"
-                else:
-                    # Remove 'nnnnnnnnn' and add formatted nanoseconds
-                    strftime_format = target_format.replace("nnnnnnnnn", "{NANOS}")
-                    
-                    # Convert human-readable format to strftime format
-                    strftime_format = _convert_readable_to_strftime(strftime_format)
-                    
-                    # Format the timestamp
-                    result = dt.strftime(strftime_format)
-                
-                # Replace {NANOS} placeholder with actual nanoseconds
-                result = result.replace("{NANOS}", nanos_str)
-                return result
+            dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    
+    # Check if format contains nanoseconds placeholder
+    if has_nanos:
+        # datetime only has microseconds, so pad with zeros to make 9 digits
+        nanos_str = "000000000" if dt.microsecond == 0 else f"{dt.microsecond * 1000:09d}"
+        return dt.strftime(strftime_format).replace("{NANOS}", nanos_str)
+    
+    return dt.strftime(strftime_format)
+
+
+def convert_timestamp_format_batch(ts_list, target_format: str) -> list:
+    """
+    Convert many timestamps to the same target format.
+    
+    epoch_ms / epoch_sec skip the per-call dispatch of convert_timestamp_format,
+    and "YYYY-MM-DDTHH:MI:SS.nnnnnnnnnZ" is formatted in bulk with numpy.
+    Other templates, and naive inputs for epoch formats, are converted per row
+    with convert_timestamp_format.
+    
+    Args:
+        ts_list: Sequence (list, tuple or array) of input timestamp strings
+        target_format (str): Same templates and custom formats as convert_timestamp_format
+    
+    Returns:
+        list: Converted timestamps, in the same order as ts_list
+    """
+    if target_format in ("epoch_ms", "epoch_sec"):
+        unit = _ONE_MS if target_format == "epoch_ms" else _ONE_SECOND
+        results = []
+        for ts in ts_list:
+            dt = _parse_timestamp(ts)
+            if dt.tzinfo is None:
+                # Naive timestamps keep the local-time handling of the scalar path
+                results.append(convert_timestamp_format(ts, target_format))
             else:
-                # Check if format contains Z (UTC indicator)
-                if "Z" in target_format:
-                    # Convert to UTC before formatting
-                    dt_utc = dt.astimezone(timezone.utc).replace(tzinfo=None)
-                    strftime_format = target_format.replace("Z", "")
-                    strftime_format = _convert_readable_to_strftime(strftime_format)
-                    result = dt_utc.strftime(strftime_format) + "Z"
-                else:
-                    # Convert human-readable format to strftime format
-                    strftime_format = _convert_readable_to_strftime(target_format)
-                    result = dt.strftime(strftime_format)
-                
-                return result
-    
-    except Exception as e:
-        raise Exception(f"Error converting timestamp: {str(e)}")
+                results.append(str((dt - _EPOCH) // unit))
+        return results
+    
+    if target_format == _BATCH_NANOS_Z_FORMAT:
+        import numpy as np
+        
+        # Microseconds since epoch in UTC (naive inputs are local time, as in the scalar path)
+        micros = []
+        for ts in ts_list:
+            dt = _parse_timestamp(ts)
+            if dt.tzinfo is None:
+                dt = dt.astimezone(timezone.utc)
+            micros.append((dt - _EPOCH) // _ONE_US)
+        
+        # datetime only has microseconds, so unit="ns" pads them to 9 digits
+        as_strings = np.datetime_as_string(np.array(micros, dtype="datetime64[us]"), unit="ns")
+        return np.char.add(as_strings, "Z").tolist()
+    
+    return [convert_timestamp_format(ts, target_format) for ts in ts_list]
 
 
 # Example usage
@@ -203,4 +305,16 @@ if __name__ == "__main__":
     for ts in test_cases:
         result = convert_timestamp_format(ts, "YYYY-MM-DDTHH:MI:SS.nnnnnnnnnZ")
         print(f"Input:  {ts}")
-        print(f"Output: {result}\n")
\ No newline at end of file
+        print(f"Output: {result}\n")
+    
+    # Batch conversion must match the scalar function (the nnnnnnnnnZ template requires numpy)
+    print("\n--- Batch vs scalar ---\n")
+    batch_inputs = test_cases + ["2025-11-07T21:09:16.015204Z", "2025-11-07T10:49:44+0530", "2025-11-07T10:49:44"]
+    for target_format in ["epoch_ms", "epoch_sec", "YYYY-MM-DDTHH:MI:SS.nnnnnnnnnZ", "HH:MI:SS"]:
+        try:
+            batch = convert_timestamp_format_batch(batch_inputs, target_format)
+        except ImportError as e:
+            print(f"{target_format}: skipped ({e})")
+            continue
+        scalar = [convert_timestamp_format(ts, target_format) for ts in batch_inputs]
+        print(f"{target_format}: matches {batch == scalar}")
\ No newline at end of file